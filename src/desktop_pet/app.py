@@ -15,7 +15,9 @@ for p in {str(_src_root), str(_bundle_root)}:
         sys.path.insert(0, p)
 
 from desktop_pet.core.config import AppConfig
+from desktop_pet.core.trace import TRACER, traced
 from desktop_pet.ui.pet_window import MOD_ALT, MOD_CONTROL, MOD_NOREPEAT, PetWindow
+from desktop_pet.ui.recolor import preset_for
 from desktop_pet.ui.tray import TrayController
  
 
@@ -44,9 +46,11 @@ def main() -> int:
         # 复制用同一个 cfg 没问题，但我们让 clone 不写 cfg（persist=False）
         c = PetWindow(cfg, persist=False)
 
-        # 同步状态：皮肤、缩放、置顶、穿透
+        # 同步状态：皮肤、缩放、置顶、穿透；颜色按顺序换一个，方便区分
         c.skin_index = base.skin_index
+        c.color_variant = preset_for(len(pets))
         c.apply_skin(c.skin_index)
+        c.set_scale(base.scale)
 
         c.set_always_on_top(base.cfg.always_on_top)
         c.set_click_through(base.is_click_through())
@@ -88,7 +92,9 @@ def main() -> int:
     _try_register(HOTKEY_ID_TOGGLE_VISIBILITY, "L")
     _try_register(HOTKEY_ID_QUIT, "Q")
     
+    @traced("app.on_hotkey", "hotkey")
     def on_hotkey(hid: int):
+        TRACER.instant("hotkey", "hotkey", id=hid)
         if hid == HOTKEY_ID_TOGGLE_CLICKTHROUGH:
             pet.toggle_click_through()
             if hasattr(tray, "act_click_through"):
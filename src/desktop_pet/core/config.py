@@ -5,6 +5,8 @@ from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
+from .trace import traced
+
 
 def appdata_dir() -> Path:
     # Windows: %APPDATA%
@@ -18,6 +20,7 @@ class AppConfig:
     scale: float = 1.0
     pos: Tuple[int, int] | None = None  # (x, y)
     gif_path: str = "assets/pet.gif"    # 默认从项目根/assets 取
+    hibernate_delay_ms: int = 30000     # 隐藏多久后休眠（释放帧/停动画），<0 表示不休眠
 
     #_path: Path | None = None
     _path: Path | None = field(default=None, repr=False, compare=False)
@@ -42,6 +45,7 @@ class AppConfig:
             cfg.save()
         return cfg
 
+    @traced("AppConfig.save", "io")
     def save(self) -> None:
         if self._path is None:
             self._path = appdata_dir() / "config.json"
@@ -65,3 +69,5 @@ class AppConfig:
             self.pos = (int(data["pos"][0]), int(data["pos"][1]))
         if "gif_path" in data:
             self.gif_path = str(data["gif_path"])
+        if "hibernate_delay_ms" in data:
+            self.hibernate_delay_ms = int(data["hibernate_delay_ms"])
@@ -8,10 +8,13 @@ from pathlib import Path
 
 
 from PySide6.QtCore import Qt, QPoint, QTimer, Signal, QRect
-from PySide6.QtGui import QPixmap, QMovie
+from PySide6.QtGui import QPixmap
 from PySide6.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QMessageBox
 
 from ..core.config import AppConfig
+from ..core.trace import TRACER, traced
+from .recolor import ORIGINAL, ColorVariant, cached_variant_frames, store_variant_frames, variant_frames
+from .scaler import FrameLoader
 from .sprite import SpriteAnimator, SpriteSet
 
 from random import randint
@@ -37,14 +40,30 @@ user32.RegisterHotKey.argtypes = [wintypes.HWND, wintypes.INT, wintypes.UINT, wi
 user32.RegisterHotKey.restype = wintypes.BOOL
 user32.UnregisterHotKey.argtypes = [wintypes.HWND, wintypes.INT]
 user32.UnregisterHotKey.restype = wintypes.BOOL
+
+# 滚轮缩放
+ZOOM_STEP = 1.1          # 每格滚轮的倍率
+ZOOM_MIN = 0.1
+ZOOM_MAX = 5.0
+ZOOM_SETTLE_MS = 250     # 停止操作多久后算“缩放结束”
+
+SNAPSHOT_MAX_SIDE = 64   # 休眠快照缩略图的最长边
     
 
+class _TracedLabel(QLabel):
+    @traced("PetWindow.paint", "paint")
+    def paintEvent(self, event):
+        super().paintEvent(event)
+
+
 class PetWindow(QWidget):
     hotkeyPressed = Signal(int)
+    scaleChanged = Signal(float)
     def __init__(self, cfg: AppConfig, persist: bool = True):
         super().__init__()
         self.cfg = cfg
         self.persist = persist
+        self.scale = max(0.05, float(cfg.scale))  # clone 各自缩放，不写回 cfg
 
         self._dragging = False
         self._drag_offset = QPoint()
@@ -66,11 +85,23 @@ class PetWindow(QWidget):
         self.setAttribute(Qt.WA_TranslucentBackground, True)
         self.setWindowFlag(Qt.FramelessWindowHint, True)
         self.setWindowFlag(Qt.Tool, True)  # 不占任务栏
+
+        # 休眠：隐藏一段时间后停动画、释放帧，只留一张快照
+        # （要在 set_always_on_top 之前：它会 show()，showEvent 里要用到）
+        self._hibernated = False
+        self._snapshot: QPixmap | None = None
+        self._snapshot_geometry = QRect()
+        self._hibernate_timer = QTimer(self)
+        self._hibernate_timer.setSingleShot(True)
+        self._hibernate_timer.timeout.connect(self.hibernate)
+        self._loader = FrameLoader(self)  # 唤醒时后台读盘/换色
+        self._loader.loaded.connect(self._on_frames_loaded)
+
         self.set_always_on_top(cfg.always_on_top)
         
         self.child_window = None 
 
-        self.label = QLabel(self)
+        self.label = _TracedLabel(self)
         self.label.setAlignment(Qt.AlignCenter)
 
         layout = QVBoxLayout(self)
@@ -83,7 +114,16 @@ class PetWindow(QWidget):
             raise FileNotFoundError("No skins found in assets/skins (png/gif)")
 
         self.skin_index = 0
-        self._movie: QMovie | None = None
+
+        # PNG/GIF 都解成帧交给 animator 播放；缩放时它负责快速预览 + 后台精修
+        self.color_variant: ColorVariant = ORIGINAL
+        self._animator = SpriteAnimator(parent=self)
+        self._animator.frame_changed.connect(self._on_animator_frame)
+
+        # 缩放手势：停下来一段时间才算结束
+        self._zoom_settle_timer = QTimer(self)
+        self._zoom_settle_timer.setSingleShot(True)
+        self._zoom_settle_timer.timeout.connect(self._commit_zoom)
 
         # 初始皮肤
         self.apply_skin(self.skin_index)
@@ -149,51 +189,128 @@ class PetWindow(QWidget):
         self.skin_index = randint(0,len(self.skins)) % len(self.skins)
         self.apply_skin(self.skin_index)
         
-    def apply_skin(self, index: int) -> None:
+    @traced("PetWindow.apply_skin", "skin")
+    def apply_skin(self, index: int, background: bool = False) -> None:
+        # 共享缓存里的原尺寸帧（原色也一样）交给 animator
+        # background=True：缓存没有就交给后台线程，当前画面先留着
         path = self.skins[index]
-        suffix = path.suffix.lower()
-
-        # 清理旧 movie
-        if self._movie is not None:
-            self._movie.stop()
-            self._movie.deleteLater()
-            self._movie = None
-
-        if suffix == ".gif":
-            mv = QMovie(str(path))
-            self._movie = mv
-            self.label.setMovie(mv)
-            mv.frameChanged.connect(lambda _: self._resize_to_label())
-            mv.start()
-            QTimer.singleShot(0, self._resize_to_label)
-        else:
-            pm = QPixmap(str(path))
-            if pm.isNull():
-                return
-            self.label.setPixmap(pm)
-            self._resize_to_pixmap(pm)
-
-    def _resize_to_pixmap(self, pm: QPixmap) -> None:
-        scale = max(0.05, float(self.cfg.scale))
-        if scale != 1.0:
-            pm = pm.scaled(int(pm.width() * scale), int(pm.height() * scale))
-            self.label.setPixmap(pm)
+        self._loader.cancel()
+        if background and cached_variant_frames(path, self.color_variant) is None:
+            self._loader.submit(path, self.color_variant)
+            return
+        self._animator.release()
+        images, delay = variant_frames(path, self.color_variant)
+        if not images:
+            return
+        self._animator.set_frames(images, delay, scale=self.scale)
+        if len(images) > 1:
+            self._animator.start()
+
+    def set_color_variant(self, variant: ColorVariant) -> None:
+        self.color_variant = variant
+        if not self._hibernated:
+            self.apply_skin(self.skin_index)
+
+    def _on_frames_loaded(self, path, variant, images, delay: int) -> None:
+        store_variant_frames(path, variant, images, delay)
+        if self._hibernated:
+            return
+        if path == self.skins[self.skin_index] and variant == self.color_variant:
+            self.apply_skin(self.skin_index)  # 这次必中缓存
+
+    def _on_animator_frame(self, pm: QPixmap) -> None:
+        self.label.setPixmap(pm)
         self.resize(pm.width(), pm.height())
         self.label.resize(pm.width(), pm.height())
 
-    def _resize_to_label(self) -> None:
-        # 对 GIF：用当前帧大小来定窗口
-        if self._movie is None:
+    # ----------------------------
+    # 休眠 / 唤醒
+    # ----------------------------
+    def hideEvent(self, event):
+        delay = int(self.cfg.hibernate_delay_ms)
+        if delay >= 0 and not self._hibernated:
+            self._hibernate_timer.start(delay)
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        self._hibernate_timer.stop()
+        if self._hibernated:
+            self.wake()
+        super().showEvent(event)
+
+    def hibernate(self) -> None:
+        if self._hibernated or self.isVisible():
+            return
+
+        # 快照：当前帧缩略图 + 几何 + 皮肤下标（skin_index 本身就留着）
+        snap = self.label.pixmap()
+        self._snapshot = None
+        if snap is not None and not snap.isNull():
+            # 缩成新的小图，不和原帧共享数据，原帧才能真正释放
+            self._snapshot = snap.scaled(SNAPSHOT_MAX_SIDE, SNAPSHOT_MAX_SIDE,
+                                         Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self._snapshot_geometry = self.geometry()
+
+        self._loader.cancel()
+        self._animator.release()
+        self.label.clear()
+        self._hibernated = True
+        TRACER.instant("hibernate", "lifecycle", skin=self.skin_index)
+
+    def wake(self) -> None:
+        if not self._hibernated:
+            return
+        self._hibernated = False
+        TRACER.instant("wake", "lifecycle", skin=self.skin_index)
+
+        # 先把缩略图放大顶上，显示出来立刻就是原样（略糊，马上会被原帧替换）
+        if self._snapshot_geometry.isValid():
+            self.setGeometry(self._snapshot_geometry)
+            if self._snapshot is not None:
+                self.label.setPixmap(self._snapshot.scaled(
+                    self._snapshot_geometry.size(), Qt.IgnoreAspectRatio, Qt.FastTransformation))
+
+        # 完整画质的帧：缓存没有就在后台线程读盘/换色，好了再换上
+        QTimer.singleShot(0, self._restore_from_hibernation)
+
+    def _restore_from_hibernation(self) -> None:
+        self._snapshot = None
+        if self._hibernated:  # 还没恢复又被藏起来休眠了
+            return
+        self.apply_skin(self.skin_index, background=True)
+
+    # ----------------------------
+    # 缩放（滚轮 / 托盘滑条）
+    # ----------------------------
+    def set_scale(self, scale: float, preview: bool = False) -> None:
+        self.scale = max(0.05, float(scale))
+        if self.persist:
+            self.cfg.scale = self.scale
+        self.scaleChanged.emit(self.scale)
+        if self._hibernated:  # 唤醒时 apply_skin 会按新缩放重建
             return
-        img = self._movie.currentImage()
-        if img.isNull():
+        self._animator.set_scale(self.scale, preview=preview)
+
+    def zoom_to(self, scale: float) -> None:
+        # 手势中的每一步：只做快速预览，等停下来再精修 + 保存
+        scale = min(ZOOM_MAX, max(ZOOM_MIN, float(scale)))
+        self.set_scale(scale, preview=True)
+        self._zoom_settle_timer.start(ZOOM_SETTLE_MS)
+
+    def _commit_zoom(self) -> None:
+        TRACER.instant("zoom_commit", "zoom", scale=self.scale)
+        self.set_scale(self.scale)
+        if self.persist:
+            self.cfg.save()
+
+    @traced("PetWindow.wheelEvent", "input")
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if not steps:
+            super().wheelEvent(event)
             return
-        w, h = img.width(), img.height()
-        scale = max(0.05, float(self.cfg.scale))
-        w = max(1, int(w * scale))
-        h = max(1, int(h * scale))
-        self.resize(w, h)
-        self.label.resize(w, h)
+        self.zoom_to(self.scale * (ZOOM_STEP ** steps))
+        event.accept()
 
     def set_always_on_top(self, enabled: bool) -> None:
         self.cfg.always_on_top = bool(enabled)
@@ -202,6 +319,7 @@ class PetWindow(QWidget):
 
     # 对话
     
+    @traced("PetWindow.msg_meowl1", "dialog")
     def msg_meowl1(self):
         reply = QMessageBox.information(self,
                                         "我是WinterPT！",
@@ -212,6 +330,7 @@ class PetWindow(QWidget):
         elif reply == QMessageBox.No: 
             self.msg_hyw()
             
+    @traced("PetWindow.msg_meowl2", "dialog")
     def msg_meowl2(self):
         reply = QMessageBox.information(self,
                                         "我是WinterPT……",
@@ -222,6 +341,7 @@ class PetWindow(QWidget):
         elif reply == QMessageBox.No: 
             self.msg_hyw()
             
+    @traced("PetWindow.msg_meowr1", "dialog")
     def msg_meowr1(self):
         reply = QMessageBox.information(self,
                                         "我是WinterPT？",
@@ -232,6 +352,7 @@ class PetWindow(QWidget):
         elif reply == QMessageBox.No: 
             self.msg_hyw()
             
+    @traced("PetWindow.msg_meowr2", "dialog")
     def msg_meowr2(self):
         reply = QMessageBox.information(self,
                                         "我是WinterPT~",
@@ -242,6 +363,7 @@ class PetWindow(QWidget):
         elif reply == QMessageBox.No: 
             self.msg_hyw()
     
+    @traced("PetWindow.msg_hyw", "dialog")
     def msg_hyw(self):
         reply = QMessageBox.information(self,
                                         "我是WinterPT。",
@@ -288,6 +410,7 @@ class PetWindow(QWidget):
         return self._click_through_enabled
 
     # ------- 单击切换 / 拖动移动 -------
+    @traced("PetWindow.mousePressEvent", "input")
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self._meow = True
@@ -297,6 +420,7 @@ class PetWindow(QWidget):
             self._drag_offset = self._press_pos - self.frameGeometry().topLeft()
             event.accept()
 
+    @traced("PetWindow.mouseMoveEvent", "input")
     def mouseMoveEvent(self, event):
         if self._dragging:
             cur = event.globalPosition().toPoint()
@@ -305,6 +429,7 @@ class PetWindow(QWidget):
             self.move(cur - self._drag_offset)
             event.accept()
 
+    @traced("PetWindow.mouseReleaseEvent", "input")
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton:
             self._dragging = False
@@ -333,6 +458,7 @@ class PetWindow(QWidget):
 
 
 #   双击判断
+    @traced("PetWindow.mouseDoubleClickEvent", "input")
     def mouseDoubleClickEvent(self, event):
         if event.button() == Qt.RightButton:
             self._right_double_click = True
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PySide6.QtGui import QImage, QImageReader
+
+from ..core.trace import traced
+
+RGB = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class ColorVariant:
+    # frozen：可以直接当缓存 key
+    name: str = "original"
+    tint: RGB | None = None        # 正片叠底的颜色
+    tint_strength: float = 0.0     # 0~1
+    hue_shift: float = 0.0         # 色相旋转（角度）
+    palette: Tuple[Tuple[RGB, RGB], ...] = ()  # 精确换色：(原色, 新色)
+
+    def is_identity(self) -> bool:
+        return self.tint_strength <= 0 and self.hue_shift % 360 == 0 and not self.palette
+
+
+ORIGINAL = ColorVariant()
+
+# clone 依次取用，方便在一群里认出来
+VARIANT_PRESETS: List[ColorVariant] = [
+    ORIGINAL,
+    ColorVariant("rose", hue_shift=300),
+    ColorVariant("mint", hue_shift=120),
+    ColorVariant("sky", hue_shift=200),
+    ColorVariant("amber", tint=(255, 190, 90), tint_strength=0.5),
+    ColorVariant("lilac", tint=(200, 160, 255), tint_strength=0.5),
+    ColorVariant("ink", hue_shift=180, tint=(120, 120, 140), tint_strength=0.4),
+    # 精确换色：把默认皮肤 000.PNG 的几种粉色换成蓝色
+    ColorVariant("snow", palette=(
+        ((255, 176, 182), (170, 210, 255)),
+        ((254, 176, 182), (170, 210, 255)),
+        ((255, 177, 182), (170, 210, 255)),
+        ((251, 145, 178), (120, 180, 245)),
+        ((255, 138, 180), (120, 180, 245)),
+        ((243, 106, 137), (80, 130, 220)),
+    )),
+]
+
+
+def preset_for(n: int) -> ColorVariant:
+    return VARIANT_PRESETS[n % len(VARIANT_PRESETS)]
+
+
+def _color_matrix(variant: ColorVariant) -> np.ndarray:
+    # 色相旋转（保持亮度，和 CSS hue-rotate 一样）再乘上染色，合成一个 3x3 矩阵
+    t = math.radians(variant.hue_shift)
+    c, s = math.cos(t), math.sin(t)
+    hue = np.array([
+        [0.213 + c * 0.787 - s * 0.213, 0.715 - c * 0.715 - s * 0.715, 0.072 - c * 0.072 + s * 0.928],
+        [0.213 - c * 0.213 + s * 0.143, 0.715 + c * 0.285 + s * 0.140, 0.072 - c * 0.072 - s * 0.283],
+        [0.213 - c * 0.213 - s * 0.787, 0.715 - c * 0.715 + s * 0.715, 0.072 + c * 0.928 + s * 0.072],
+    ], dtype=np.float32)
+    if variant.tint is not None and variant.tint_strength > 0:
+        k = min(1.0, float(variant.tint_strength))
+        tint = np.array(variant.tint, dtype=np.float32) / 255.0
+        hue = np.diag((1.0 - k) + k * tint).astype(np.float32) @ hue
+    return hue
+
+
+# 定点数：系数放大 4096 倍转成 int32（255*4096*3 远不到溢出），和浮点结果最多差 1
+_FIXED_SHIFT = 12
+_CHUNK = 1 << 14  # 分块算，中间数组留在缓存里；透明边角整块跳过
+
+
+def _pack(rgb: RGB) -> int:
+    return (int(rgb[0]) << 16) | (int(rgb[1]) << 8) | int(rgb[2])
+
+
+def recolor_batch(pixels: np.ndarray, variant: ColorVariant) -> np.ndarray:
+    """对 (N, H, W, 4) 的 BGRA uint8 数组整批换色，alpha 不动。"""
+    if variant.is_identity():
+        return pixels
+    out = np.ascontiguousarray(pixels).copy()
+    flat = out.reshape(-1, 4)
+
+    # 换色表按原图匹配，先把掩码算出来
+    masks = []
+    if variant.palette:
+        keys = flat.view(np.uint32)[:, 0] & 0x00FFFFFF
+        masks = [(keys == _pack(src), (dst[2], dst[1], dst[0])) for src, dst in variant.palette]
+
+    if variant.tint_strength > 0 or variant.hue_shift % 360 != 0:
+        # 矩阵行列倒过来直接作用在 BGR 上
+        m = np.round(_color_matrix(variant)[::-1, ::-1] * (1 << _FIXED_SHIFT)).astype(np.int32)
+        half = np.int32(1 << (_FIXED_SHIFT - 1))
+        for start in range(0, len(flat), _CHUNK):
+            f = flat[start:start + _CHUNK]
+            if not f[:, 3].any():  # 整块全透明，跳过
+                continue
+            b, g, r = (f[:, k].astype(np.int32) for k in range(3))
+            for c in range(3):
+                v = b * m[c, 0]
+                v += g * m[c, 1]
+                v += r * m[c, 2]
+                v += half
+                v >>= _FIXED_SHIFT
+                np.clip(v, 0, 255, out=v)
+                f[:, c] = v  # b/g/r 已经拷出来了，原地写回不影响后面的通道
+
+    for mask, dst in masks:
+        flat[mask, :3] = dst
+    return out
+
+
+def _to_array(images: List[QImage]) -> np.ndarray:
+    # constBits() 的 memoryview 不会让 QImage 活着，转换后的图要留到 stack 之后
+    converted = [img.convertToFormat(QImage.Format_ARGB32) for img in images]
+    arrs = []
+    for img in converted:
+        w, h, bpl = img.width(), img.height(), img.bytesPerLine()
+        buf = np.frombuffer(img.constBits(), dtype=np.uint8, count=h * bpl)
+        arrs.append(buf.reshape(h, bpl)[:, : w * 4].reshape(h, w, 4))
+    return np.stack(arrs)
+
+
+def _to_images(pixels: np.ndarray) -> List[QImage]:
+    n, h, w, _ = pixels.shape
+    out = []
+    for i in range(n):
+        data = np.ascontiguousarray(pixels[i]).tobytes()
+        out.append(QImage(data, w, h, w * 4, QImage.Format_ARGB32).copy())
+    return out
+
+
+@traced("recolor_images", "recolor")
+def recolor_images(images: List[QImage], variant: ColorVariant) -> List[QImage]:
+    if variant.is_identity() or not images:
+        return list(images)
+    # 同尺寸的帧拼成一批，一次向量化算完
+    groups: Dict[Tuple[int, int], List[int]] = {}
+    for i, img in enumerate(images):
+        groups.setdefault((img.width(), img.height()), []).append(i)
+    result: List[QImage] = list(images)
+    for idx in groups.values():
+        batch = recolor_batch(_to_array([images[i] for i in idx]), variant)
+        for i, img in zip(idx, _to_images(batch)):
+            result[i] = img
+    return result
+
+
+def read_frames(path: Path) -> Tuple[List[QImage], int]:
+    """读出 PNG/GIF 的全部帧，返回 (帧, 平均每帧毫秒)。"""
+    reader = QImageReader(str(path))
+    frames: List[QImage] = []
+    delays: List[int] = []
+    while True:
+        img = reader.read()
+        if img.isNull():
+            break
+        frames.append(img)
+        delays.append(max(10, reader.nextImageDelay()))
+        if not reader.supportsAnimation() or not reader.canRead():
+            break
+    delay = int(sum(delays) / len(delays)) if delays else 100
+    return frames, delay
+
+
+# (皮肤, 变体) -> 原尺寸的换色帧（QImage）；所有宠物共享，同一个变体只算一次。
+# QPixmap 由各自的 animator 建，休眠时随之释放；缩放交给 animator 的后台精修。
+# 按字节数限制大小，超了先丢最久没用的
+_CACHE_MAX_BYTES = 128 * 1024 * 1024
+_Frames = Tuple[List[QImage], int]
+_cache: "OrderedDict[Tuple[str, ColorVariant], _Frames]" = OrderedDict()
+_cache_bytes = 0
+
+
+def _frames_bytes(value: _Frames) -> int:
+    return sum(img.sizeInBytes() for img in value[0])
+
+
+def _cache_get(key):
+    hit = _cache.get(key)
+    if hit is not None:
+        _cache.move_to_end(key)
+    return hit
+
+
+def _cache_put(key, value: _Frames) -> None:
+    global _cache_bytes
+    old = _cache.pop(key, None)
+    if old is not None:
+        _cache_bytes -= _frames_bytes(old)
+    _cache[key] = value
+    _cache_bytes += _frames_bytes(value)
+    while _cache_bytes > _CACHE_MAX_BYTES and len(_cache) > 1:  # 最新这条总留着
+        _, dropped = _cache.popitem(last=False)
+        _cache_bytes -= _frames_bytes(dropped)
+
+
+def load_variant_images(path: Path, variant: ColorVariant) -> Tuple[List[QImage], int]:
+    """读盘 + 换色，只碰 QImage，可以在后台线程跑。"""
+    images, delay = read_frames(path)
+    return recolor_images(images, variant), delay
+
+
+def cached_variant_frames(path: Path, variant: ColorVariant) -> _Frames | None:
+    return _cache_get((str(path), variant))
+
+
+def store_variant_frames(path: Path, variant: ColorVariant,
+                         images: List[QImage], delay: int) -> _Frames:
+    # 缓存不加锁，只在 GUI 线程调用
+    value = (images, delay)
+    _cache_put((str(path), variant), value)
+    return value
+
+
+def variant_frames(path: Path, variant: ColorVariant) -> _Frames:
+    """按 (皮肤, 变体) 取换色后的 (帧, 每帧毫秒)，没有就算一次并缓存。"""
+    hit = cached_variant_frames(path, variant)
+    if hit is not None:
+        return hit
+    return store_variant_frames(path, variant, *load_variant_images(path, variant))
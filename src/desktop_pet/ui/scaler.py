@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Sequence
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage
+
+from ..core.trace import traced
+from .recolor import ColorVariant, load_variant_images
+
+
+class _ScaleSignals(QObject):
+    frame_ready = Signal(int, int, QImage)  # token, index, image
+
+
+class _Ticket:
+    # 每个后台任务自己的作废标记：纯 Python 对象，窗口被删了也能安全读
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+
+class _ScaleJob(QRunnable):
+    def __init__(self, signals: _ScaleSignals, ticket: _Ticket, token: int,
+                 sources: List[QImage | Path], scale: float, order: List[int]):
+        super().__init__()
+        # 强引用 signals：发起方的 QObject 没了，这里也不会访问到已删除的 C++ 对象
+        self._signals = signals
+        self._ticket = ticket
+        self._token = token
+        self._sources = sources
+        self._scale = scale
+        self._order = order
+
+    @traced("FrameScaler.job", "scale")
+    def run(self) -> None:
+        signals = self._signals
+        for i in self._order:
+            if self._ticket.cancelled:  # 已被新的请求取代
+                return
+            src = self._sources[i]
+            img = src if isinstance(src, QImage) else QImage(str(src))
+            if img.isNull():
+                continue
+            w = max(1, int(img.width() * self._scale))
+            h = max(1, int(img.height() * self._scale))
+            img = img.scaled(w, h, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            signals.frame_ready.emit(self._token, i, img)
+
+
+class FrameScaler(QObject):
+    """后台线程里做高质量缩放；新请求会让旧请求作废。"""
+
+    frame_ready = Signal(int, QImage)  # index, image（回到 GUI 线程）
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._token = 0
+        self._current = [_Ticket()]  # 装在列表里，对象被删时回调也能拿到当前那张
+        # 不挂 parent：由本对象和正在跑的任务共同持有，谁最后放手谁释放
+        self._signals = _ScaleSignals()
+        self._signals.frame_ready.connect(self._on_frame_ready)
+        # 所属窗口被删：让还在跑的任务尽快退出
+        cur = self._current
+        self.destroyed.connect(lambda *_: setattr(cur[0], "cancelled", True))
+
+    def cancel(self) -> None:
+        self._current[0].cancelled = True
+        self._current[0] = _Ticket()
+        self._token += 1
+
+    def submit(self, sources: Sequence[QImage | Path], scale: float, first: int = 0) -> None:
+        # QPixmap 不能跨线程，只接受 QImage 或文件路径
+        self.cancel()
+        sources = list(sources)
+        if not sources:
+            return
+        first = min(max(0, first), len(sources) - 1)
+        order = [first] + [i for i in range(len(sources)) if i != first]  # 先缩当前帧
+        job = _ScaleJob(self._signals, self._current[0], self._token, sources, float(scale), order)
+        QThreadPool.globalInstance().start(job)
+
+    def _on_frame_ready(self, token: int, index: int, img: QImage) -> None:
+        if token == self._token:
+            self.frame_ready.emit(index, img)
+
+
+class _LoadSignals(QObject):
+    loaded = Signal(int, object, int)  # token, images, delay
+
+
+class _LoadJob(QRunnable):
+    def __init__(self, signals: _LoadSignals, ticket: _Ticket, token: int,
+                 path: Path, variant: ColorVariant):
+        super().__init__()
+        self._signals = signals
+        self._ticket = ticket
+        self._token = token
+        self._path = path
+        self._variant = variant
+
+    @traced("FrameLoader.job", "load")
+    def run(self) -> None:
+        if self._ticket.cancelled:
+            return
+        images, delay = load_variant_images(self._path, self._variant)
+        if not self._ticket.cancelled:
+            self._signals.loaded.emit(self._token, images, delay)
+
+
+class FrameLoader(QObject):
+    """后台线程里读盘 + 换色；结果回到 GUI 线程再进缓存。新请求会让旧请求作废。"""
+
+    loaded = Signal(object, object, object, int)  # path, variant, images, delay
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._token = 0
+        self._request: tuple = ()
+        self._current = [_Ticket()]
+        self._signals = _LoadSignals()
+        self._signals.loaded.connect(self._on_loaded)
+        cur = self._current
+        self.destroyed.connect(lambda *_: setattr(cur[0], "cancelled", True))
+
+    def cancel(self) -> None:
+        self._current[0].cancelled = True
+        self._current[0] = _Ticket()
+        self._token += 1
+
+    def submit(self, path: Path, variant: ColorVariant) -> None:
+        self.cancel()
+        self._request = (path, variant)
+        job = _LoadJob(self._signals, self._current[0], self._token, path, variant)
+        QThreadPool.globalInstance().start(job)
+
+    def _on_loaded(self, token: int, images, delay: int) -> None:
+        if token == self._token:
+            path, variant = self._request
+            self.loaded.emit(path, variant, images, delay)
@@ -2,10 +2,24 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
-from PySide6.QtCore import QObject, QTimer, Signal
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+from PySide6.QtGui import QImage, QPixmap, QPixmapCache
+
+from ..core.trace import traced
+from .scaler import FrameScaler
+
+
+def cached_pixmap(path: Path) -> QPixmap:
+    # 帧统一放进 QPixmapCache（全局 LRU），多只宠物共享；被挤出后再从磁盘读
+    key = f"desktop_pet:{path}"
+    pm = QPixmapCache.find(key)
+    if pm is None or pm.isNull():
+        pm = QPixmap(str(path))
+        if not pm.isNull():
+            QPixmapCache.insert(key, pm)
+    return pm
 
 
 @dataclass
@@ -24,9 +38,14 @@ class SpriteAnimator(QObject):
         self.scale = max(0.05, float(scale))
 
         self._frames: List[QPixmap] = []
+        self._sources: List[QImage | Path] = []  # 后台精修的原图（QPixmap 不能跨线程）
         self._index = 0
         self._loop = True
 
+        # 当前缩放下的高质量帧（后台线程生成），没好之前用快速缩放顶着
+        self._scaled: Dict[int, QPixmap] = {}
+        self._scaler: FrameScaler | None = None  # 第一次需要精修时再建
+
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._next)
 
@@ -37,9 +56,28 @@ class SpriteAnimator(QObject):
 
         self._loop = sprite.loop
         self._index = 0
-        self._frames = [QPixmap(str(p)) for p in files]
+        self._sources = list(files)
+        self._frames = [cached_pixmap(p) for p in files]
+        self._cancel_refine()
 
         self.set_fps(sprite.fps)
+        self._refine()
+        self._emit_current()
+
+    def set_frames(self, images: List[QImage], interval_ms: int, loop: bool = True,
+                   scale: float | None = None) -> None:
+        # 直接播放解好的帧（比如共享缓存里的换色皮肤）；QPixmap 自己建，
+        # release() 时就能真正放掉，原图留给后台精修用
+        # scale 一起给，避免先按旧缩放发一帧
+        self._cancel_refine()
+        if scale is not None:
+            self.scale = max(0.05, float(scale))
+        self._sources = list(images)
+        self._loop = loop
+        self._frames = [QPixmap.fromImage(img) for img in images]
+        self._index = min(self._index, len(self._frames) - 1) if self._frames else 0
+        self._timer.setInterval(max(1, int(interval_ms)))
+        self._refine()
         self._emit_current()
 
     def set_fps(self, fps: int) -> None:
@@ -53,20 +91,57 @@ class SpriteAnimator(QObject):
     def stop(self) -> None:
         self._timer.stop()
 
-    def set_scale(self, scale: float) -> None:
+    def release(self) -> None:
+        # 休眠/换皮肤：停掉计时器，把帧的引用还给共享缓存
+        self.stop()
+        self._cancel_refine()
+        self._frames = []
+        self._sources = []
+        self._index = 0  # 下次从头播，不要接着旧皮肤的下标
+
+    def set_scale(self, scale: float, preview: bool = False) -> None:
+        # preview=True：缩放手势进行中，只做快速缩放，不启动后台精修
         self.scale = max(0.05, float(scale))
+        self._cancel_refine()
+        if not preview:
+            self._refine()
         self._emit_current()
 
+    def _cancel_refine(self) -> None:
+        self._scaled.clear()
+        if self._scaler is not None:
+            self._scaler.cancel()
+
+    def _refine(self) -> None:
+        if self.scale == 1.0 or not self._frames:
+            return
+        if self._scaler is None:
+            self._scaler = FrameScaler(self)
+            self._scaler.frame_ready.connect(self._on_scaled_frame)
+        self._scaler.submit(self._sources, self.scale, first=self._index)
+
+    def _on_scaled_frame(self, index: int, img: QImage) -> None:
+        if not self._frames:
+            return
+        self._scaled[index] = QPixmap.fromImage(img)
+        if index == self._index:
+            self._emit_current()
+
     def _emit_current(self) -> None:
         if not self._frames:
             return
+        pm = self._scaled.get(self._index)
+        if pm is not None:
+            self.frame_changed.emit(pm)
+            return
         pm = self._frames[self._index]
         if self.scale != 1.0 and not pm.isNull():
             w = max(1, int(pm.width() * self.scale))
             h = max(1, int(pm.height() * self.scale))
-            pm = pm.scaled(w, h)  # 默认平滑策略够用了
+            pm = pm.scaled(w, h, Qt.IgnoreAspectRatio, Qt.FastTransformation)
         self.frame_changed.emit(pm)
 
+    @traced("SpriteAnimator._next", "anim")
     def _next(self) -> None:
         if not self._frames:
             return
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import time
 from pathlib import Path
 
-from PySide6.QtGui import QIcon, QAction
-from PySide6.QtWidgets import QSystemTrayIcon, QMenu
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QIcon, QAction, QActionGroup
+from PySide6.QtWidgets import QSystemTrayIcon, QMenu, QSlider, QWidgetAction
 
-from ..core.config import AppConfig
-from .pet_window import PetWindow, project_root
+from ..core.config import AppConfig, appdata_dir
+from ..core.trace import TRACER
+from .pet_window import ZOOM_MAX, ZOOM_MIN, PetWindow, project_root
+from .recolor import VARIANT_PRESETS
 
 
 class TrayController:
@@ -33,6 +37,27 @@ class TrayController:
         self.act_topmost.triggered.connect(self._toggle_topmost)
         menu.addAction(self.act_topmost)
 
+        # 缩放滑条（百分比），和滚轮缩放走同一套预览/精修逻辑
+        self.zoom_slider = QSlider(Qt.Horizontal)
+        self.zoom_slider.setRange(int(ZOOM_MIN * 100), int(ZOOM_MAX * 100))
+        self.zoom_slider.setValue(int(round(pet.scale * 100)))
+        self.zoom_slider.setToolTip("Zoom")
+        self.zoom_slider.valueChanged.connect(lambda v: self.pet.zoom_to(v / 100))
+        act_zoom = QWidgetAction(menu)
+        act_zoom.setDefaultWidget(self.zoom_slider)
+        menu.addAction(act_zoom)
+        pet.scaleChanged.connect(self._sync_zoom_slider)
+
+        # 换色：预设列表，单选
+        self.color_menu = menu.addMenu("Color")
+        self.color_group = QActionGroup(self.color_menu)
+        for variant in VARIANT_PRESETS:
+            act = QAction(variant.name, self.color_group)
+            act.setCheckable(True)
+            act.setChecked(variant == pet.color_variant)
+            act.triggered.connect(lambda _=False, v=variant: self.pet.set_color_variant(v))
+            self.color_menu.addAction(act)
+
         menu.addSeparator()
 
         act_quit = QAction("Quit")
@@ -51,6 +76,18 @@ class TrayController:
         self.act_clone.triggered.connect(lambda: self.on_clone())
         menu.addAction(self.act_clone)
 
+        # 事件追踪：开关 + 导出 Chrome/Perfetto trace
+        menu.addSeparator()
+        self.act_tracing = QAction("Event tracing")
+        self.act_tracing.setCheckable(True)
+        self.act_tracing.setChecked(TRACER.enabled)
+        self.act_tracing.triggered.connect(self._toggle_tracing)
+        menu.addAction(self.act_tracing)
+
+        self.act_dump_trace = QAction("Dump trace")
+        self.act_dump_trace.triggered.connect(self._dump_trace)
+        menu.addAction(self.act_dump_trace)
+
         
         def _toggle_click_through(self):
             self.pet.set_click_through(self.act_click_through.isChecked())
@@ -68,6 +105,11 @@ class TrayController:
             self.pet.show()
             self.act_toggle_show.setText("Hide")
 
+    def _sync_zoom_slider(self, scale: float):
+        self.zoom_slider.blockSignals(True)
+        self.zoom_slider.setValue(int(round(scale * 100)))
+        self.zoom_slider.blockSignals(False)
+
     def _toggle_topmost(self):
         self.pet.set_always_on_top(self.act_topmost.isChecked())
 
@@ -83,6 +125,18 @@ class TrayController:
     
     def _toggle_click_through(self):
         self.pet.set_click_through(self.act_click_through.isChecked())
+
+    def _toggle_tracing(self):
+        TRACER.set_enabled(self.act_tracing.isChecked())
+
+    def _dump_trace(self):
+        name = time.strftime("trace-%Y%m%d-%H%M%S.json")
+        try:
+            path = TRACER.dump(appdata_dir() / "traces" / name)
+        except OSError as exc:
+            self.tray.showMessage("Trace dump failed", str(exc), QSystemTrayIcon.Warning)
+            return
+        self.tray.showMessage("Trace saved", str(path))
             
     
 